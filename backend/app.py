@@ -1,133 +1,196 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
 import re
 import random
+import zlib
+import threading
 import jwt
-from datetime import datetime, timedelta
+import orjson
 from supabase import create_client, Client
-from functools import wraps
+from functools import wraps, lru_cache
+from typing import Optional
+from json_provider import ORJSONProvider
+from patterns import DIGIT_RE, compile_savings_patterns
+from timestamps import now_iso
+from token_cache import VerifiedTokenCache
 import logging
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for React Native
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-change-this')
+# Reject oversized request bodies before they are read or parsed
+app.config['MAX_CONTENT_LENGTH'] = 4096
+
+# Longest chat message the mascot will process
+MAX_MESSAGE_LENGTH = 512
 
 # Supabase configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY') or os.getenv('SUPABASE_SERVICE_KEY')
 
-# Initialize Supabase client only if credentials are provided
-supabase = None
-if SUPABASE_URL and SUPABASE_KEY and not SUPABASE_URL.startswith('https://your-project'):
-    try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        logger.info("Supabase client initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Supabase client: {str(e)}")
-        supabase = None
-else:
-    logger.warning("Supabase not configured - running in demo mode. Database features will be simulated.")
-    logger.warning("To enable full functionality, update your .env file with actual Supabase credentials.")
+supabase: Optional[Client] = None
+
+def init_supabase():
+    """Create this process's Supabase client, or fall back to demo mode"""
+    global supabase
+    # Initialize Supabase client only if credentials are provided
+    if SUPABASE_URL and SUPABASE_KEY and not SUPABASE_URL.startswith('https://your-project'):
+        try:
+            supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+            logger.info("Supabase client initialized successfully")
+        except Exception as e:
+            logger.error("Failed to initialize Supabase client: %s", e)
+            supabase = None
+    else:
+        logger.warning("Supabase not configured - running in demo mode. Database features will be simulated.")
+        logger.warning("To enable full functionality, update your .env file with actual Supabase credentials.")
+
+init_supabase()
+
+# Financial literacy tips as (title, content) pairs
+FINANCIAL_TIPS = (
+    (
+        "Emergency Fund",
+        "Aim to save 3-6 months of expenses for emergencies. Start small - even ₱500 is better than nothing!"
+    ),
+    (
+        "50/30/20 Rule",
+        "Allocate 50% for needs, 30% for wants, and 20% for savings and debt repayment."
+    ),
+    (
+        "Start Early",
+        "The power of compound interest means that starting to save even small amounts early can make a huge difference over time."
+    ),
+    (
+        "Track Your Spending",
+        "Knowledge is power! Understanding where your money goes is the first step to better financial health."
+    ),
+    (
+        "Pay Yourself First",
+        "Set aside savings before spending on anything else. Automate transfers to make it easier."
+    ),
+    (
+        "Avoid Lifestyle Inflation",
+        "As your income grows, resist the urge to spend it all. Increase your savings rate instead."
+    ),
+    (
+        "Multiple Income Streams",
+        "Consider developing additional income sources to increase your financial security."
+    ),
+    (
+        "Invest in Yourself",
+        "Education and skill development are investments that can pay dividends throughout your career."
+    )
+)
+
+# Natural language patterns for savings extraction
+SAVINGS_PATTERNS = (
+    r'(?:saved|save|put aside|set aside|deposited)\s*(?:php|₱|pesos?|p)?\s*(\d+(?:\.\d{2})?)',
+    r'(?:php|₱|pesos?|p)\s*(\d+(?:\.\d{2})?)\s*(?:saved|save|put aside|set aside)',
+    r'(\d+(?:\.\d{2})?)\s*(?:php|₱|pesos?|p)\s*(?:saved|save|today|yesterday)',
+    r'managed to save\s*(?:php|₱|pesos?|p)?\s*(\d+(?:\.\d{2})?)',
+    r'saved\s*(\d+(?:\.\d{2})?)\s*(?:php|₱|pesos?|p)?',
+)
+
+# Motivational responses for savings updates
+MOTIVATIONAL_RESPONSES = (
+    "🎉 Awesome job! Every peso saved is a step towards your goals!",
+    "💪 You're building great financial habits! Keep it up!",
+    "🌟 Fantastic! Your future self will thank you for this!",
+    "🎯 Great progress! Small steps lead to big achievements!",
+    "✨ Well done! You're taking control of your financial future!",
+    "🚀 Amazing! You're on the right track to financial success!",
+    "💖 Love seeing your commitment to your goals!",
+    "🏆 Every saving counts! You're doing fantastic!"
+)
+
+# General motivational messages
+MOTIVATIONAL_MESSAGES = (
+    "Remember, financial freedom is a journey, not a destination! 🌟",
+    "Every small step counts towards your big financial goals! 💪",
+    "Building wealth is like building muscles - consistency is key! 🏋️‍♀️",
+    "Your future self is cheering you on! Keep going! 🎉",
+    "Smart money habits today = financial peace tomorrow! ✨"
+)
+
+# Default replies when a message is neither a savings update nor a tip request
+FRIENDLY_RESPONSES = (
+    "I'm here to help you with your financial journey! Try telling me about your savings or ask for a financial tip! 💰",
+    "Great to chat with you! I can help track your savings, provide financial tips, or just motivate you on your financial journey! 🌟",
+    "Hello! I'm MonT, your financial buddy! Tell me about your savings goals or ask for some financial wisdom! 🎯",
+    "Hi there! Ready to build some great financial habits together? Share your savings or ask me for tips! 💪"
+)
+
+# Currency reported in savings responses and the symbol used when formatting it
+DEFAULT_CURRENCY = 'PHP'
+CURRENCY_SYMBOLS = {'PHP': '₱'}
+
+# Demo mode simulates progress towards a ₱1000 goal
+DEMO_GOAL_TARGET = 1000
+DEMO_SAVINGS_NOTE = "\n\n💡 *Demo Mode: Connect Supabase for real data persistence*"
+
+# Keywords that route a chat message to a tip or a motivational reply, matched
+# case-insensitively anywhere in the message in a single scan
+TIP_KEYWORDS_RE = re.compile(r'tip|advice|help|learn', re.IGNORECASE)
+MOTIVATION_KEYWORDS_RE = re.compile(r'motivation|encourage|support', re.IGNORECASE)
+
+# One random generator per worker thread, so request threads never share PRNG state
+_rng_local = threading.local()
+
+def _rng():
+    """Return the calling thread's random generator"""
+    rng = getattr(_rng_local, 'rng', None)
+    if rng is None:
+        rng = _rng_local.rng = random.Random()
+    return rng
 
 class FinancialMascot:
+    __slots__ = ('name', 'personality', 'financial_tips', 'savings_patterns', 'motivational_responses')
+
+    # Compiled once and shared by every instance
+    _savings_re = compile_savings_patterns(SAVINGS_PATTERNS)
+
     def __init__(self):
         self.name = "MonT"
         self.personality = "friendly, encouraging, and knowledgeable about finance"
-        
-        # Financial literacy tips
-        self.financial_tips = [
-            {
-                "title": "Emergency Fund",
-                "content": "Aim to save 3-6 months of expenses for emergencies. Start small - even ₱500 is better than nothing!"
-            },
-            {
-                "title": "50/30/20 Rule",
-                "content": "Allocate 50% for needs, 30% for wants, and 20% for savings and debt repayment."
-            },
-            {
-                "title": "Start Early",
-                "content": "The power of compound interest means that starting to save even small amounts early can make a huge difference over time."
-            },
-            {
-                "title": "Track Your Spending",
-                "content": "Knowledge is power! Understanding where your money goes is the first step to better financial health."
-            },
-            {
-                "title": "Pay Yourself First",
-                "content": "Set aside savings before spending on anything else. Automate transfers to make it easier."
-            },
-            {
-                "title": "Avoid Lifestyle Inflation",
-                "content": "As your income grows, resist the urge to spend it all. Increase your savings rate instead."
-            },
-            {
-                "title": "Multiple Income Streams",
-                "content": "Consider developing additional income sources to increase your financial security."
-            },
-            {
-                "title": "Invest in Yourself",
-                "content": "Education and skill development are investments that can pay dividends throughout your career."
-            }
-        ]
-        
-        # Natural language patterns for savings extraction
-        self.savings_patterns = [
-            r'(?:saved|save|put aside|set aside|deposited)\s*(?:php|₱|pesos?|p)?\s*(\d+(?:\.\d{2})?)',
-            r'(?:php|₱|pesos?|p)\s*(\d+(?:\.\d{2})?)\s*(?:saved|save|put aside|set aside)',
-            r'(\d+(?:\.\d{2})?)\s*(?:php|₱|pesos?|p)\s*(?:saved|save|today|yesterday)',
-            r'managed to save\s*(?:php|₱|pesos?|p)?\s*(\d+(?:\.\d{2})?)',
-            r'saved\s*(\d+(?:\.\d{2})?)\s*(?:php|₱|pesos?|p)?',
-        ]
-        
-        # Motivational responses
-        self.motivational_responses = [
-            "🎉 Awesome job! Every peso saved is a step towards your goals!",
-            "💪 You're building great financial habits! Keep it up!",
-            "🌟 Fantastic! Your future self will thank you for this!",
-            "🎯 Great progress! Small steps lead to big achievements!",
-            "✨ Well done! You're taking control of your financial future!",
-            "🚀 Amazing! You're on the right track to financial success!",
-            "💖 Love seeing your commitment to your goals!",
-            "🏆 Every saving counts! You're doing fantastic!"
-        ]
+        self.financial_tips = FINANCIAL_TIPS
+        self.savings_patterns = SAVINGS_PATTERNS
+        self.motivational_responses = MOTIVATIONAL_RESPONSES
 
     def extract_savings_amount(self, message):
         """Extract savings amount from natural language message"""
-        message_lower = message.lower()
+        if not DIGIT_RE.search(message):
+            return None
         
-        for pattern in self.savings_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                try:
-                    amount = float(match.group(1))
-                    return amount
-                except (ValueError, IndexError):
-                    continue
+        match = self._savings_re.search(message)
+        if not match:
+            return None
+        
+        for group in match.groups():
+            if group is not None:
+                return float(group)
         
         return None
 
     def get_currency_from_message(self, message):
         """Extract currency from message"""
-        message_lower = message.lower()
-        if 'php' in message_lower or '₱' in message_lower or 'peso' in message_lower:
-            return 'PHP'
-        return 'PHP'  # Default to PHP
+        # Pesos are the only supported currency, so there is nothing to scan for
+        return DEFAULT_CURRENCY
 
     def generate_savings_response(self, amount, currency, progress_data=None):
         """Generate response for savings updates"""
-        response = random.choice(self.motivational_responses)
+        response = _rng().choice(self.motivational_responses)
         
-        if currency.upper() == 'PHP':
-            currency_symbol = '₱'
-        else:
-            currency_symbol = currency
+        currency_symbol = CURRENCY_SYMBOLS.get(currency, currency)
             
         amount_str = f"{currency_symbol}{amount:.2f}"
         
@@ -145,22 +208,31 @@ class FinancialMascot:
 
     def get_random_tip(self):
         """Get a random financial tip"""
-        return random.choice(self.financial_tips)
+        title, content = _rng().choice(self.financial_tips)
+        return {'title': title, 'content': content}
 
     def generate_motivational_message(self, context=None):
         """Generate general motivational message"""
-        messages = [
-            "Remember, financial freedom is a journey, not a destination! 🌟",
-            "Every small step counts towards your big financial goals! 💪",
-            "Building wealth is like building muscles - consistency is key! 🏋️‍♀️",
-            "Your future self is cheering you on! Keep going! 🎉",
-            "Smart money habits today = financial peace tomorrow! ✨"
-        ]
-        return random.choice(messages)
+        return _rng().choice(MOTIVATIONAL_MESSAGES)
 
 # Initialize the mascot
 mascot = FinancialMascot()
 
+def today_iso():
+    """Current local date in ISO format"""
+    return now_iso()[:10]
+
+def json_object_body():
+    """Parsed JSON request body if it is an object, otherwise None"""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+def is_number(value):
+    """True for JSON numbers, which bool values do not count as"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+_token_cache = VerifiedTokenCache(ttl=5)
+
 def verify_token(f):
     """Decorator to verify JWT token"""
     @wraps(f)
@@ -169,10 +241,14 @@ def verify_token(f):
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         
+        if token.startswith('Bearer '):
+            token = token[7:]
+        
+        cached_user = _token_cache.get(token)
+        if cached_user:
+            return f(cached_user, *args, **kwargs)
+        
         try:
-            if token.startswith('Bearer '):
-                token = token[7:]
-            
             # For development, you might want to implement a simpler verification
             # In production, verify with Supabase
             data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
@@ -182,40 +258,52 @@ def verify_token(f):
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Token is invalid'}), 401
         except Exception as e:
-            logger.error(f"Token verification error: {str(e)}")
+            logger.error("Token verification error: %s", e)
             return jsonify({'error': 'Token verification failed'}), 401
-            
+        
+        _token_cache.put(token, current_user, data.get('exp'))
+        
         return f(current_user, *args, **kwargs)
     return decorated
 
+# The health payload only depends on startup configuration, so it is serialized
+# once instead of on every load balancer probe
+HEALTH_RESPONSE_BODY = orjson.dumps({
+    'status': 'healthy',
+    'service': 'Financial Mascot Backend',
+    'mascot': mascot.name,
+    'database': 'connected' if supabase else 'demo_mode',
+    'mode': 'production' if supabase else 'demo',
+    'message': 'Supabase connected - full functionality' if supabase else 'Demo mode - simulated responses'
+})
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Financial Mascot Backend',
-        'mascot': mascot.name,
-        'database': 'connected' if supabase else 'demo_mode',
-        'mode': 'production' if supabase else 'demo',
-        'timestamp': datetime.now().isoformat(),
-        'message': 'Supabase connected - full functionality' if supabase else 'Demo mode - simulated responses'
-    })
+    return app.response_class(HEALTH_RESPONSE_BODY, mimetype='application/json')
 
 @app.route('/api/mascot/chat', methods=['POST'])
 def chat_with_mascot():
     """Main chat endpoint for the financial mascot"""
     try:
-        data = request.get_json()
-        message = data.get('message', '').strip()
+        data = json_object_body()
+        if data is None:
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        message = data.get('message')
         user_id = data.get('user_id')
         
-        if not message:
+        if not isinstance(message, str) or not message.strip():
             return jsonify({'error': 'Message is required'}), 400
+        message = message.strip()
         
-        if not user_id:
+        if not isinstance(user_id, str) or not user_id:
             return jsonify({'error': 'User ID is required'}), 400
         
-        logger.info(f"Chat request from user {user_id}: {message}")
+        if len(message) > MAX_MESSAGE_LENGTH:
+            return jsonify({'error': f'Message must be at most {MAX_MESSAGE_LENGTH} characters'}), 413
+        
+        logger.info("Chat request from user %s: %s", user_id, message)
         
         # Extract savings amount from message
         savings_amount = mascot.extract_savings_amount(message)
@@ -226,48 +314,13 @@ def chat_with_mascot():
             
             if supabase:
                 try:
-                    # Get user's active savings goal
-                    goals_response = supabase.table('savings_goals')\
-                        .select('*')\
-                        .eq('user_id', user_id)\
-                        .order('created_at', desc=True)\
-                        .limit(1)\
-                        .execute()
-                    
-                    goal = None
-                    if goals_response.data:
-                        goal = goals_response.data[0]
-                    
-                    # Insert savings transaction
-                    transaction_data = {
-                        'user_id': user_id,
-                        'amount': savings_amount,
-                        'description': f"Savings from chat: {message}",
-                        'transaction_date': datetime.now().date().isoformat()
-                    }
-                    
-                    if goal:
-                        transaction_data['goal_id'] = goal['id']
-                        
-                        # Update goal's current amount
-                        new_current = goal['current_amount'] + savings_amount
-                        progress = (new_current / goal['target_amount']) * 100 if goal['target_amount'] > 0 else 0
-                        
-                        supabase.table('savings_goals')\
-                            .update({'current_amount': new_current, 'updated_at': datetime.now().isoformat()})\
-                            .eq('id', goal['id'])\
-                            .execute()
-                        
-                        progress_data = {
-                            'new_total': new_current,
-                            'progress': progress,
-                            'goal_name': goal['goal_name'],
-                            'target_amount': goal['target_amount']
-                        }
-                    else:
-                        progress_data = {'new_total': savings_amount, 'progress': 0}
-                    
-                    supabase.table('savings_transactions').insert(transaction_data).execute()
+                    # Update the latest goal and record the transaction in one round trip
+                    result = supabase.rpc('record_savings', {
+                        'uid': user_id,
+                        'amt': savings_amount,
+                        'descr': f"Savings from chat: {message}"
+                    }).execute()
+                    progress_data = result.data[0]
                     
                     response_text = mascot.generate_savings_response(
                         savings_amount, 
@@ -288,7 +341,7 @@ def chat_with_mascot():
                     })
                     
                 except Exception as e:
-                    logger.error(f"Database error: {str(e)}")
+                    logger.error("Database error: %s", e)
                     # Fallback to demo mode but don't change the global supabase variable
                     pass
             
@@ -296,14 +349,12 @@ def chat_with_mascot():
             if not supabase:
                 # Demo mode - simulate database functionality
                 logger.info("Running in demo mode - simulating database response")
-                demo_total = savings_amount * random.randint(5, 20)  # Simulate existing savings
-                demo_progress = (demo_total / 1000) * 100  # Simulate progress towards ₱1000 goal
-                
+                # Simulate existing savings with a 5-20x multiplier derived from the
+                # user ID, so repeated messages from one user stay consistent
+                demo_total = savings_amount * (zlib.crc32(str(user_id).encode()) % 16 + 5)
                 progress_data = {
                     'new_total': demo_total,
-                    'progress': min(demo_progress, 100),
-                    'goal_name': 'Emergency Fund',
-                    'target_amount': 1000
+                    'progress': min(demo_total / DEMO_GOAL_TARGET * 100, 100)
                 }
                 
                 response_text = mascot.generate_savings_response(
@@ -311,7 +362,7 @@ def chat_with_mascot():
                     currency, 
                     progress_data
                 )
-                response_text += "\n\n💡 *Demo Mode: Connect Supabase for real data persistence*"
+                response_text += DEMO_SAVINGS_NOTE
                 
                 return jsonify({
                     'response': response_text,
@@ -327,9 +378,7 @@ def chat_with_mascot():
                 })
         
         # Handle general financial questions and tips
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ['tip', 'advice', 'help', 'learn']):
+        if TIP_KEYWORDS_RE.search(message):
             tip = mascot.get_random_tip()
             return jsonify({
                 'response': f"Here's a financial tip for you:\n\n**{tip['title']}**\n{tip['content']}",
@@ -338,7 +387,7 @@ def chat_with_mascot():
                 'tip_data': tip
             })
         
-        if any(word in message_lower for word in ['motivation', 'encourage', 'support']):
+        if MOTIVATION_KEYWORDS_RE.search(message):
             motivational_msg = mascot.generate_motivational_message()
             return jsonify({
                 'response': motivational_msg,
@@ -347,26 +396,57 @@ def chat_with_mascot():
             })
         
         # Default friendly response
-        friendly_responses = [
-            "I'm here to help you with your financial journey! Try telling me about your savings or ask for a financial tip! 💰",
-            "Great to chat with you! I can help track your savings, provide financial tips, or just motivate you on your financial journey! 🌟",
-            "Hello! I'm MonT, your financial buddy! Tell me about your savings goals or ask for some financial wisdom! 🎯",
-            "Hi there! Ready to build some great financial habits together? Share your savings or ask me for tips! 💪"
-        ]
-        
         return jsonify({
-            'response': random.choice(friendly_responses),
+            'response': _rng().choice(FRIENDLY_RESPONSES),
             'type': 'general',
             'mascot': mascot.name
         })
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        logger.error(f"Chat error: {str(e)}")
+        logger.error("Chat error: %s", e)
         return jsonify({
             'error': 'Something went wrong processing your message',
             'details': str(e) if app.debug else None
         }), 500
 
+@lru_cache(maxsize=1)
+def demo_stats_body(today):
+    """Serialized demo-mode stats; identical for every request on a given day"""
+    return orjson.dumps({
+        'total_saved': 1250.50,
+        'goals_count': 3,
+        'active_goals': 2,
+        'this_month_saved': 340.00,
+        'goals': [
+            {
+                'id': 1,
+                'goal_name': 'Emergency Fund',
+                'target_amount': 5000,
+                'current_amount': 1250.50,
+                'progress': 25.01
+            },
+            {
+                'id': 2,
+                'goal_name': 'Vacation',
+                'target_amount': 10000,
+                'current_amount': 2500,
+                'progress': 25.0
+            }
+        ],
+        'recent_transactions': [
+            {
+                'id': 1,
+                'amount': 50.0,
+                'description': 'Demo savings',
+                'transaction_date': today
+            }
+        ],
+        'mascot': mascot.name,
+        'demo_mode': True
+    })
+
 @app.route('/api/mascot/stats', methods=['GET'])
 def get_user_stats():
     """Get user's financial statistics"""
@@ -376,82 +456,32 @@ def get_user_stats():
             return jsonify({'error': 'User ID is required'}), 400
         
         if supabase:
-            # Get user's savings goals
-            goals_response = supabase.table('savings_goals')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .execute()
-            
-            # Get user's transactions
-            transactions_response = supabase.table('savings_transactions')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .execute()
-            
-            goals = goals_response.data or []
-            transactions = transactions_response.data or []
+            # Totals, goal counts and recent transactions are aggregated in Postgres
+            result = supabase.rpc('user_stats', {'uid': user_id}).execute()
             
-            # Calculate statistics
-            total_saved = sum(t['amount'] for t in transactions)
-            goals_count = len(goals)
-            active_goals = len([g for g in goals if g['current_amount'] < g['target_amount']])
-            
-            # This month's savings
-            current_month = datetime.now().strftime('%Y-%m')
-            this_month_transactions = [
-                t for t in transactions 
-                if t['transaction_date'].startswith(current_month)
-            ]
-            this_month_saved = sum(t['amount'] for t in this_month_transactions)
-            
-            return jsonify({
-                'total_saved': total_saved,
-                'goals_count': goals_count,
-                'active_goals': active_goals,
-                'this_month_saved': this_month_saved,
-                'goals': goals,
-                'recent_transactions': transactions[-10:],  # Last 10 transactions
+            response = jsonify({
+                **result.data[0],
                 'mascot': mascot.name
             })
+            # Absorb rapid re-renders of the stats screen without refetching
+            response.cache_control.private = True
+            response.cache_control.max_age = 5
+            response.add_etag()
+            return response.make_conditional(request)
         else:
             # Demo mode with simulated data
             logger.info("Stats request in demo mode")
-            demo_stats = {
-                'total_saved': 1250.50,
-                'goals_count': 3,
-                'active_goals': 2,
-                'this_month_saved': 340.00,
-                'goals': [
-                    {
-                        'id': 1,
-                        'goal_name': 'Emergency Fund',
-                        'target_amount': 5000,
-                        'current_amount': 1250.50,
-                        'progress': 25.01
-                    },
-                    {
-                        'id': 2,
-                        'goal_name': 'Vacation',
-                        'target_amount': 10000,
-                        'current_amount': 2500,
-                        'progress': 25.0
-                    }
-                ],
-                'recent_transactions': [
-                    {
-                        'id': 1,
-                        'amount': 50.0,
-                        'description': 'Demo savings',
-                        'transaction_date': datetime.now().date().isoformat()
-                    }
-                ],
-                'mascot': mascot.name,
-                'demo_mode': True
-            }
-            return jsonify(demo_stats)
+            response = app.response_class(
+                demo_stats_body(today_iso()),
+                mimetype='application/json'
+            )
+            response.cache_control.public = True
+            response.cache_control.max_age = 60
+            response.add_etag()
+            return response.make_conditional(request)
         
     except Exception as e:
-        logger.error(f"Stats error: {str(e)}")
+        logger.error("Stats error: %s", e)
         return jsonify({
             'error': 'Unable to retrieve statistics',
             'details': str(e) if app.debug else None
@@ -462,13 +492,18 @@ def get_financial_tip():
     """Get a random financial tip"""
     try:
         tip = mascot.get_random_tip()
-        return jsonify({
+        response = jsonify({
             'tip': tip,
             'mascot': mascot.name,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
+        # Any tip will do for a repeat request, so let clients and proxies reuse one.
+        # No ETag: a random tip plus a timestamp would almost never revalidate.
+        response.cache_control.public = True
+        response.cache_control.max_age = 60
+        return response
     except Exception as e:
-        logger.error(f"Tips error: {str(e)}")
+        logger.error("Tips error: %s", e)
         return jsonify({
             'error': 'Unable to retrieve tip',
             'details': str(e) if app.debug else None
@@ -478,7 +513,10 @@ def get_financial_tip():
 def create_savings_goal():
     """Create a new savings goal"""
     try:
-        data = request.get_json()
+        data = json_object_body()
+        if data is None:
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
         user_id = data.get('user_id')
         goal_name = data.get('goal_name')
         target_amount = data.get('target_amount')
@@ -487,25 +525,38 @@ def create_savings_goal():
         if not all([user_id, goal_name, target_amount]):
             return jsonify({'error': 'User ID, goal name, and target amount are required'}), 400
         
+        if not isinstance(user_id, str) or not isinstance(goal_name, str):
+            return jsonify({'error': 'User ID and goal name must be strings'}), 400
+        
+        if not is_number(target_amount) or target_amount <= 0:
+            return jsonify({'error': 'Target amount must be a positive number'}), 400
+        
+        if target_date is not None and not isinstance(target_date, str):
+            return jsonify({'error': 'Target date must be an ISO date string'}), 400
+        
         goal_data = {
             'user_id': user_id,
             'goal_name': goal_name,
             'target_amount': target_amount,
-            'current_amount': 0,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
+            'target_date': target_date or None
         }
         
-        if target_date:
-            goal_data['target_date'] = target_date
-        
         if supabase:
+            # current_amount, created_at and updated_at come from the column
+            # defaults, and the insert returns the stored row in the same round trip
             result = supabase.table('savings_goals').insert(goal_data).execute()
             goal_result = result.data[0] if result.data else goal_data
         else:
             # Demo mode
             logger.info("Goal creation in demo mode")
-            goal_result = {**goal_data, 'id': random.randint(100, 999)}
+            now = now_iso()
+            goal_result = {
+                **goal_data,
+                'id': _rng().randint(100, 999),
+                'current_amount': 0,
+                'created_at': now,
+                'updated_at': now
+            }
         
         response_msg = f"🎯 Great! I've created your '{goal_name}' goal for ₱{target_amount:.2f}. Start saving towards it!"
         
@@ -519,8 +570,10 @@ def create_savings_goal():
             'demo_mode': not bool(supabase)
         })
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        logger.error(f"Goal creation error: {str(e)}")
+        logger.error("Goal creation error: %s", e)
         return jsonify({
             'error': 'Unable to create goal',
             'details': str(e) if app.debug else None
@@ -540,6 +593,13 @@ def not_found(error):
         ]
     }), 404
 
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({
+        'error': 'Request body too large',
+        'mascot': mascot.name
+    }), 413
+
 @app.errorhandler(500)
 def internal_error(error):
     return jsonify({
@@ -551,8 +611,8 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_ENV') == 'development'
     
-    logger.info(f"Starting Financial Mascot Backend on port {port}")
-    logger.info(f"Mascot: {mascot.name}")
-    logger.info(f"Debug mode: {debug}")
+    logger.info("Starting Financial Mascot Backend on port %s", port)
+    logger.info("Mascot: %s", mascot.name)
+    logger.info("Debug mode: %s", debug)
     
     app.run(host='0.0.0.0', port=port, debug=debug)
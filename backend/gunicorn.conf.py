@@ -0,0 +1,62 @@
+"""
+Gunicorn settings for the Financial Mascot backend.
+
+Run from the backend directory with: gunicorn
+"""
+
+import multiprocessing
+import os
+import sys
+
+
+def _requested_worker_class():
+    """Worker class from -k/--worker-class, which override this file, else the env default"""
+    args = sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg in ('-k', '--worker-class') and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith('--worker-class='):
+            return arg.split('=', 1)[1]
+        if arg.startswith('-k') and len(arg) > 2:
+            return arg[2:]
+    return os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+
+wsgi_app = 'app:app'
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# The endpoints are synchronous and spend most of their time waiting on Supabase,
+# so each worker runs a thread pool to keep serving while requests block on I/O
+worker_class = _requested_worker_class()
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Concurrent requests per worker when running gevent workers
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+if 'gevent' in worker_class:
+    # The app is preloaded in the master, long before the gevent worker would
+    # patch the standard library in each child. Patch here instead, so the
+    # Supabase clients, SSL contexts, locks and thread pools the app creates at
+    # import are built on gevent's cooperative versions.
+    from gevent import monkey
+
+    monkey.patch_all()
+
+# Import the app once in the master so the compiled patterns and response tables
+# are shared with the workers copy-on-write
+preload_app = True
+
+# Recycle workers periodically to keep memory fragmentation in check
+max_requests = 10000
+max_requests_jitter = 500
+
+
+def post_fork(server, worker):
+    # Give each worker its own Supabase client, and with it its own HTTP
+    # connection pool, instead of sharing the one created in the preloaded master.
+    # Only applies when serving app:app; mascot:app is left untouched.
+    app = sys.modules.get('app')
+
+    if app and app.supabase:
+        app.init_supabase()
@@ -0,0 +1,31 @@
+"""
+orjson-backed JSON provider shared by the backend Flask apps.
+"""
+
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson for request parsing and jsonify responses"""
+    option = orjson.OPT_NON_STR_KEYS
+
+    @staticmethod
+    def default(obj):
+        # Match Flask's default provider, which serializes Decimal as a string
+        if isinstance(obj, Decimal):
+            return str(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype='application/json')
@@ -6,18 +6,31 @@ provides financial literacy tips, and offers motivational feedback.
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from flask_compress import Compress
 import os
 import re
-from datetime import datetime, timedelta
 import logging
 from supabase import create_client, Client
+from postgrest.utils import SyncClient as PostgrestSession
+import httpx
 import jwt
 from functools import wraps
 import random
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from json_provider import ORJSONProvider
+from patterns import DIGIT_RE, compile_savings_patterns
+from timestamps import now_iso
+from token_cache import VerifiedTokenCache
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
+# gzip/brotli-compress JSON responses for clients that accept it
+Compress(app)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,7 +41,28 @@ SUPABASE_URL = os.getenv('SUPABASE_URL', 'your-supabase-url')
 SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_KEY', 'your-supabase-service-key')
 SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET', 'your-jwt-secret')
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Connection limits for the shared PostgREST session; every handler goes through
+# this one client, so its pool is what keeps TCP/TLS connections alive between requests
+POSTGREST_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+def create_pooled_client(url: str, key: str) -> Client:
+    """Create the Supabase client with a PostgREST session sized for concurrent workers"""
+    client = create_client(url, key)
+    session = client.postgrest.session
+    client.postgrest.session = PostgrestSession(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        limits=POSTGREST_POOL_LIMITS
+    )
+    session.close()
+    return client
+
+supabase: Client = create_pooled_client(SUPABASE_URL, SUPABASE_KEY)
+
+# Worker threads for issuing independent Supabase queries from one request in
+# parallel; a stats request hands two queries to the pool and runs the third itself
+_supabase_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='supabase')
 
 class FinancialMascot:
     """Friendly financial advisor mascot with personality and intelligence"""
@@ -81,19 +115,40 @@ class FinancialMascot:
             r"i\s+(?:saved|put away|set aside)\s+(?:php\s*|₱\s*)?(\d+(?:\.\d{2})?)",
             r"added\s+(?:php\s*|₱\s*)?(\d+(?:\.\d{2})?)\s*to.*savings"
         ]
+        
+        # Scanned once per message instead of once per pattern
+        self._savings_re = compile_savings_patterns(self.savings_patterns)
+        
+        # Topic keywords for general questions, matched case-insensitively anywhere
+        # in the message ("budget" also covers "budgeting", "goal" covers "goals")
+        self._budget_keywords = re.compile(r"budget|expense", re.IGNORECASE)
+        self._savings_keywords = re.compile(r"save|saving", re.IGNORECASE)
+        self._goal_keywords = re.compile(r"goal|target", re.IGNORECASE)
+        
+        # Tips and phrases are served from preshuffled rings instead of drawing a
+        # random index per call; next() on a cycle is atomic under the GIL
+        self._tip_cycles = {
+            category: itertools.cycle(random.sample(tips, len(tips)))
+            for category, tips in self.literacy_tips.items()
+        }
+        self._motivation_cycle = itertools.cycle(
+            random.sample(self.motivational_phrases, len(self.motivational_phrases))
+        )
+
+    def next_tip(self, category: str) -> str:
+        """Next tip from the given category's rotation"""
+        return next(self._tip_cycles[category])
 
     def extract_savings_amount(self, message: str) -> float:
         """Extract savings amount from user message using NLP patterns"""
-        message_lower = message.lower().strip()
+        if not DIGIT_RE.search(message):
+            return 0.0
         
-        for pattern in self.savings_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                try:
-                    amount = float(match.group(1))
-                    return amount
-                except (ValueError, IndexError):
-                    continue
+        match = self._savings_re.search(message)
+        if match:
+            for group in match.groups():
+                if group is not None:
+                    return float(group)
         
         return 0.0
 
@@ -102,24 +157,24 @@ class FinancialMascot:
         progress_percent = (total_saved / goal_amount * 100) if goal_amount > 0 else 0
         
         # Choose motivational phrase
-        motivation = random.choice(self.motivational_phrases)
+        motivation = next(self._motivation_cycle)
         
         # Generate contextual message
         if progress_percent >= 100:
             message = f"{motivation} You've reached your savings goal! 🎉 Total saved: ₱{total_saved:,.2f}"
-            tip = random.choice(self.literacy_tips["goals"])
+            tip = self.next_tip("goals")
         elif progress_percent >= 75:
             message = f"{motivation} You're so close! Only ₱{goal_amount - total_saved:,.2f} left to reach your goal!"
             tip = "🔥 You're in the final stretch - keep that momentum going!"
         elif progress_percent >= 50:
             message = f"{motivation} Halfway there! You've saved ₱{amount:,.2f} today. Total: ₱{total_saved:,.2f}"
-            tip = random.choice(self.literacy_tips["savings"])
+            tip = self.next_tip("savings")
         elif progress_percent >= 25:
             message = f"{motivation} Great progress! ₱{amount:,.2f} added today brings you to ₱{total_saved:,.2f}"
-            tip = random.choice(self.literacy_tips["budgeting"])
+            tip = self.next_tip("budgeting")
         else:
             message = f"{motivation} Every journey starts with a single step! ₱{amount:,.2f} saved today."
-            tip = random.choice(self.literacy_tips["savings"])
+            tip = self.next_tip("savings")
         
         return {
             "message": message,
@@ -132,29 +187,35 @@ class FinancialMascot:
 
     def generate_general_response(self, message: str) -> dict:
         """Generate response for general financial queries"""
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ["budget", "budgeting", "expense"]):
-            tip = random.choice(self.literacy_tips["budgeting"])
+        if self._budget_keywords.search(message):
+            tip = self.next_tip("budgeting")
             response = f"Great question about budgeting! {tip}"
-        elif any(word in message_lower for word in ["save", "saving", "savings"]):
-            tip = random.choice(self.literacy_tips["savings"])
+        elif self._savings_keywords.search(message):
+            tip = self.next_tip("savings")
             response = f"I love talking about savings! {tip}"
-        elif any(word in message_lower for word in ["goal", "goals", "target"]):
-            tip = random.choice(self.literacy_tips["goals"])
+        elif self._goal_keywords.search(message):
+            tip = self.next_tip("goals")
             response = f"Goals are so important! {tip}"
         else:
             response = "I'm here to help with your financial journey! Ask me about savings, budgeting, or setting goals! 💰"
-            tip = random.choice(self.literacy_tips["savings"])
+            tip = self.next_tip("savings")
         
         return {
             "message": response,
-            "tip": tip
+            "tip": tip,
+            "type": "general"
         }
 
 # Initialize mascot
 mascot = FinancialMascot()
 
+# Tip categories and greeting for the tips endpoint, fixed once the mascot exists
+TIP_CATEGORIES = tuple(mascot.literacy_tips)
+TIP_CATEGORY_SET = frozenset(TIP_CATEGORIES)
+TIPS_MASCOT_MESSAGE = f"Hi! It's {mascot.name} with your daily financial tip! 🌟"
+
+_token_cache = VerifiedTokenCache(ttl=10)
+
 def authenticate_user(f):
     """Decorator to authenticate user via Supabase JWT token"""
     @wraps(f)
@@ -168,13 +229,26 @@ def authenticate_user(f):
             if token.startswith('Bearer '):
                 token = token[7:]
             
-            # Decode JWT token
-            payload = jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=['HS256'])
+            cached_user = _token_cache.get(token)
+            if cached_user:
+                request.user_id = cached_user
+                return f(*args, **kwargs)
+            
+            # Decode JWT token. Supabase access tokens carry aud='authenticated',
+            # which is not checked here; the signature and exp are
+            payload = jwt.decode(
+                token,
+                SUPABASE_JWT_SECRET,
+                algorithms=['HS256'],
+                options={'require': ['sub'], 'verify_aud': False}
+            )
             user_id = payload.get('sub')
             
             if not user_id:
                 return jsonify({'error': 'Invalid token'}), 401
             
+            _token_cache.put(token, user_id, payload.get('exp'))
+            
             # Add user_id to request context
             request.user_id = user_id
             return f(*args, **kwargs)
@@ -209,11 +283,9 @@ def chat_with_mascot():
         else:
             # Handle general conversation
             response_data = mascot.generate_general_response(message)
-            response_data['type'] = 'general'
         
         # Add mascot personality
-        response_data['mascot_name'] = mascot.name
-        response_data['timestamp'] = datetime.utcnow().isoformat()
+        response_data.update(mascot_name=mascot.name, timestamp=now_iso(utc=True))
         
         return jsonify(response_data)
         
@@ -224,61 +296,33 @@ def chat_with_mascot():
 def handle_savings_input(user_id: str, amount: float, original_message: str) -> dict:
     """Process savings input and update database"""
     try:
-        # Get user's active savings goal
-        goal_response = supabase.table('savings_goals').select('*').eq('user_id', user_id).eq('status', 'active').execute()
-        
-        if not goal_response.data:
-            # Create default savings goal if none exists
-            default_goal = {
-                'user_id': user_id,
-                'goal_name': 'My Savings Goal',
-                'target_amount': 10000.0,  # Default ₱10,000 goal
-                'current_amount': 0.0,
-                'status': 'active',
-                'created_at': datetime.utcnow().isoformat(),
-                'target_date': (datetime.utcnow() + timedelta(days=365)).isoformat()
-            }
-            
-            supabase.table('savings_goals').insert(default_goal).execute()
-            current_goal = default_goal
-        else:
-            current_goal = goal_response.data[0]
+        # Find or create the active goal, add the amount and record the
+        # transaction in one database call
+        result = supabase.rpc('record_mascot_savings', {
+            'p_user': user_id,
+            'p_amount': amount,
+            'p_desc': f"Savings added via mascot: {original_message[:100]}"
+        }).execute()
+        
+        if not result.data:
+            raise Exception("Failed to update savings goal")
         
-        # Update savings goal with new amount
-        new_total = float(current_goal['current_amount']) + amount
+        # The goal's current_amount changed, so drop the cached copy used by tips
+        evict_active_goal(user_id)
         
-        update_response = supabase.table('savings_goals').update({
-            'current_amount': new_total,
-            'updated_at': datetime.utcnow().isoformat()
-        }).eq('user_id', user_id).eq('id', current_goal['id']).execute()
+        current_goal = result.data[0]
+        new_total = float(current_goal['new_total'])
+        logger.info(f"Updated savings for user {user_id}: +₱{amount}, total: ₱{new_total}")
         
-        if update_response.data:
-            logger.info(f"Updated savings for user {user_id}: +₱{amount}, total: ₱{new_total}")
-            
-            # Record savings transaction
-            transaction = {
-                'user_id': user_id,
-                'amount': amount,
-                'transaction_type': 'savings',
-                'description': f"Savings added via mascot: {original_message[:100]}",
-                'transaction_date': datetime.utcnow().isoformat(),
-                'category': 'savings'
-            }
-            
-            supabase.table('savings_transactions').insert(transaction).execute()
-            
-            # Generate motivational response
-            response_data = mascot.generate_savings_response(
-                amount, 
-                new_total, 
-                float(current_goal['target_amount'])
-            )
-            response_data['type'] = 'savings_update'
-            response_data['goal_name'] = current_goal['goal_name']
-            
-            return response_data
-        else:
-            raise Exception("Failed to update savings goal")
+        # Generate motivational response
+        response_data = mascot.generate_savings_response(
+            amount, 
+            new_total, 
+            float(current_goal['target_amount'])
+        )
+        response_data.update(type='savings_update', goal_name=current_goal['goal_name'])
+        
+        return response_data
             
     except Exception as e:
         logger.error(f"Error handling savings input: {str(e)}")
@@ -296,7 +340,7 @@ def get_user_goals():
         user_id = request.user_id
         
         # Get all user's savings goals
-        response = supabase.table('savings_goals').select('*').eq('user_id', user_id).order('created_at', desc=True).execute()
+        response = supabase.table('savings_goals').select('id,goal_name,target_amount,current_amount,status,target_date,created_at').eq('user_id', user_id).order('created_at', desc=True).execute()
         
         goals = []
         for goal in response.data:
@@ -324,6 +368,37 @@ def get_user_goals():
         logger.error(f"Error getting user goals: {str(e)}")
         return jsonify({'error': 'Failed to fetch goals'}), 500
 
+# Active goal per user for the tips endpoint, wrapped in a 1-tuple so users
+# without an active goal are cached too; savings updates evict the user's entry
+_active_goal_cache = TTLCache(maxsize=10000, ttl=60)
+_active_goal_cache_lock = threading.Lock()
+# Bumped on every eviction, so a lookup that started before a savings update
+# does not write the old goal back into the cache
+_active_goal_generation = {}
+
+def evict_active_goal(user_id: str):
+    """Drop the user's cached goal and invalidate lookups already in flight"""
+    with _active_goal_cache_lock:
+        _active_goal_cache.pop(user_id, None)
+        _active_goal_generation[user_id] = _active_goal_generation.get(user_id, 0) + 1
+
+def get_active_goal(user_id: str):
+    """User's first active goal (name, target and current amount), cached briefly"""
+    with _active_goal_cache_lock:
+        cached = _active_goal_cache.get(user_id)
+        generation = _active_goal_generation.get(user_id, 0)
+    if cached is not None:
+        return cached[0]
+    
+    # Same goal record_mascot_savings credits: the oldest active one
+    response = supabase.table('savings_goals').select('goal_name,target_amount,current_amount').eq('user_id', user_id).eq('status', 'active').order('created_at').limit(1).execute()
+    goal = response.data[0] if response.data else None
+    
+    with _active_goal_cache_lock:
+        if _active_goal_generation.get(user_id, 0) == generation:
+            _active_goal_cache[user_id] = (goal,)
+    return goal
+
 @app.route('/api/mascot/tips', methods=['GET'])
 @authenticate_user
 def get_daily_tips():
@@ -331,26 +406,23 @@ def get_daily_tips():
     try:
         user_id = request.user_id
         tip_category = request.args.get('category', 'savings')
-        
-        if tip_category not in mascot.literacy_tips:
+        if tip_category not in TIP_CATEGORY_SET:
             tip_category = 'savings'
         
         # Get user's savings progress for personalized tips
-        goal_response = supabase.table('savings_goals').select('*').eq('user_id', user_id).eq('status', 'active').execute()
+        goal = get_active_goal(user_id)
         
-        tips = mascot.literacy_tips[tip_category]
-        daily_tip = random.choice(tips)
+        daily_tip = mascot.next_tip(tip_category)
         
         response_data = {
             'tip': daily_tip,
             'category': tip_category,
-            'mascot_message': f"Hi! It's {mascot.name} with your daily financial tip! 🌟",
-            'available_categories': list(mascot.literacy_tips.keys())
+            'mascot_message': TIPS_MASCOT_MESSAGE,
+            'available_categories': TIP_CATEGORIES
         }
         
         # Add personalized message if user has active goals
-        if goal_response.data:
-            goal = goal_response.data[0]
+        if goal:
             progress = (float(goal['current_amount']) / float(goal['target_amount']) * 100) if goal['target_amount'] > 0 else 0
             
             if progress > 0:
@@ -369,27 +441,31 @@ def get_user_stats():
     try:
         user_id = request.user_id
         
+        # The three queries are independent: two run on the pool while the request
+        # thread runs the third, so the endpoint waits roughly one round trip
+        
         # Get savings goals stats
-        goals_response = supabase.table('savings_goals').select('*').eq('user_id', user_id).execute()
+        goals_future = _supabase_pool.submit(
+            supabase.table('savings_goals').select('current_amount,status').eq('user_id', user_id).execute
+        )
+        
+        # Get recent transactions (only counted, so no columns beyond the id)
+        transactions_future = _supabase_pool.submit(
+            supabase.table('savings_transactions').select('id').eq('user_id', user_id).order('transaction_date', desc=True).limit(30).execute
+        )
+        
+        # Consecutive days with savings, counted in the database
+        streak_response = supabase.rpc('savings_streak', {'p_user': user_id}).execute()
+        streak_days = streak_response.data[0]['streak']
         
-        # Get recent transactions
-        transactions_response = supabase.table('savings_transactions').select('*').eq('user_id', user_id).order('transaction_date', desc=True).limit(30).execute()
+        goals_response = goals_future.result()
+        transactions_response = transactions_future.result()
         
         # Calculate statistics
         total_saved = sum(float(goal['current_amount']) for goal in goals_response.data)
         active_goals = len([g for g in goals_response.data if g['status'] == 'active'])
         completed_goals = len([g for g in goals_response.data if g['status'] == 'completed'])
         
-        # Calculate savings streak (days with savings transactions)
-        recent_dates = set()
-        for transaction in transactions_response.data:
-            if transaction['transaction_type'] == 'savings':
-                date = datetime.fromisoformat(transaction['transaction_date']).date()
-                recent_dates.add(date)
-        
-        # Calculate current streak
-        streak_days = calculate_savings_streak(recent_dates)
-        
         stats = {
             'total_saved': total_saved,
             'active_goals': active_goals,
@@ -406,28 +482,6 @@ def get_user_stats():
         logger.error(f"Error getting user stats: {str(e)}")
         return jsonify({'error': 'Failed to fetch statistics'}), 500
 
-def calculate_savings_streak(recent_dates):
-    """Calculate consecutive days with savings"""
-    if not recent_dates:
-        return 0
-    
-    sorted_dates = sorted(recent_dates, reverse=True)
-    today = datetime.now().date()
-    
-    streak = 0
-    current_date = today
-    
-    for date in sorted_dates:
-        if date == current_date:
-            streak += 1
-            current_date -= timedelta(days=1)
-        elif date == current_date:
-            continue
-        else:
-            break
-    
-    return streak
-
 def generate_encouragement_message(total_saved, streak_days, completed_goals):
     """Generate personalized encouragement based on user's progress"""
     if completed_goals > 0:
@@ -447,7 +501,7 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'mascot': mascot.name,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': now_iso(utc=True)
     })
 
 if __name__ == '__main__':
@@ -0,0 +1,24 @@
+"""
+Regex helpers shared by the backend Flask apps.
+"""
+
+import re
+
+# Prefer RE2's linear-time matcher for the savings patterns when google-re2 is
+# installed; the stdlib engine handles the same syntax as a fallback.
+try:
+    import re2 as savings_re_engine
+except ImportError:
+    savings_re_engine = re
+
+# Every savings pattern needs a number; used to skip messages without one
+DIGIT_RE = re.compile(r'\d')
+
+
+def compile_savings_patterns(patterns):
+    """Fuse savings patterns into one case-insensitive alternation.
+
+    Each pattern contributes one capture group, so the amount is the first group
+    of a match that is not None.
+    """
+    return savings_re_engine.compile("(?i)" + "|".join(f"(?:{p})" for p in patterns))
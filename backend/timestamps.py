@@ -0,0 +1,21 @@
+"""
+Response timestamps shared by the backend Flask apps.
+"""
+
+import time
+from datetime import datetime, timezone
+
+# (epoch second, ISO timestamp) of the most recent now_iso() call, per clock
+_now_iso_cache = {False: (0, ''), True: (0, '')}
+
+
+def now_iso(utc=False):
+    """Current local (or UTC) time in ISO format, formatted at most once per second"""
+    second = int(time.time())
+    cached_second, cached_iso = _now_iso_cache[utc]
+    if second != cached_second:
+        # Naive ISO string in either case, matching datetime.now()/utcnow() output
+        tz = timezone.utc if utc else None
+        cached_iso = datetime.fromtimestamp(second, tz).replace(tzinfo=None).isoformat()
+        _now_iso_cache[utc] = (second, cached_iso)
+    return cached_iso
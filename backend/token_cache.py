@@ -0,0 +1,41 @@
+"""
+Short-lived cache of verified JWTs shared by the backend Flask apps.
+"""
+
+import hashlib
+import threading
+import time
+
+from cachetools import TTLCache
+
+
+class VerifiedTokenCache:
+    """Recently verified tokens and their user IDs.
+
+    Entries are keyed by a BLAKE2 digest of the raw token, so the tokens
+    themselves are never held in memory. A hit is only served while the token's
+    own exp claim is still in the future; invalid tokens are never stored.
+    """
+
+    def __init__(self, ttl, maxsize=10000):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token):
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token):
+        """User ID for a recently verified, unexpired token, otherwise None"""
+        key = self._key(token)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and (cached[1] is None or cached[1] > time.time()):
+            return cached[0]
+        return None
+
+    def put(self, token, user_id, exp):
+        """Remember a token that just passed verification"""
+        key = self._key(token)
+        with self._lock:
+            self._cache[key] = (user_id, exp)
@@ -0,0 +1,10 @@
+-- Composite index for per-user expense range queries
+-- Purpose: Expense lookups filter on user_id plus a date range (monthly totals
+-- and category spending). Covering amount and category lets Postgres answer
+-- them with an index-only scan instead of heap fetches.
+-- Date: 2026-10-15
+
+CREATE INDEX IF NOT EXISTS idx_expenses_user_date
+  ON expenses(user_id, date) INCLUDE (amount, category);
+
+ANALYZE expenses;
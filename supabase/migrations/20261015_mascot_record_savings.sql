@@ -0,0 +1,55 @@
+-- Record a chat savings entry in one round trip
+-- Purpose: backend/app.py used to read the latest savings goal, update its
+-- current_amount and insert a savings transaction as three separate REST calls.
+-- This function does all three in a single transaction and returns the new totals
+-- as a one-row table.
+-- Schema: savings_goals / savings_transactions as described in backend/SETUP_GUIDE.md
+-- Date: 2026-10-15
+
+CREATE OR REPLACE FUNCTION record_savings(uid UUID, amt NUMERIC, descr TEXT)
+RETURNS TABLE (
+  new_total NUMERIC,
+  progress NUMERIC,
+  goal_name TEXT,
+  target_amount NUMERIC
+) AS $$
+#variable_conflict use_column
+DECLARE
+  goal savings_goals%ROWTYPE;
+BEGIN
+  -- Latest goal for the user, locked so concurrent entries add up correctly
+  SELECT * INTO goal
+  FROM savings_goals
+  WHERE user_id = uid
+  ORDER BY created_at DESC
+  LIMIT 1
+  FOR UPDATE;
+
+  IF FOUND THEN
+    UPDATE savings_goals
+    SET current_amount = current_amount + amt,
+        updated_at = NOW()
+    WHERE id = goal.id
+    RETURNING * INTO goal;
+  END IF;
+
+  INSERT INTO savings_transactions (user_id, goal_id, amount, description, transaction_date)
+  VALUES (uid, goal.id, amt, descr, CURRENT_DATE);
+
+  IF goal.id IS NULL THEN
+    RETURN QUERY SELECT amt, 0::NUMERIC, NULL::TEXT, NULL::NUMERIC;
+    RETURN;
+  END IF;
+
+  RETURN QUERY SELECT
+    goal.current_amount::NUMERIC,
+    CASE
+      WHEN goal.target_amount > 0 THEN goal.current_amount / goal.target_amount * 100
+      ELSE 0
+    END,
+    goal.goal_name::TEXT,
+    goal.target_amount::NUMERIC;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION record_savings(UUID, NUMERIC, TEXT) TO service_role;
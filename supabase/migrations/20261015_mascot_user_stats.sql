@@ -0,0 +1,60 @@
+-- Savings statistics for the mascot stats endpoint
+-- Purpose: backend/app.py used to download every goal and every savings
+-- transaction for a user and aggregate them in Python. This function returns the
+-- totals, goal counts, goal list and the 10 latest transactions as a one-row
+-- table.
+-- Schema: savings_goals / savings_transactions as described in backend/SETUP_GUIDE.md
+-- Date: 2026-10-15
+
+CREATE OR REPLACE FUNCTION user_stats(uid UUID)
+RETURNS TABLE (
+  total_saved NUMERIC,
+  goals_count BIGINT,
+  active_goals BIGINT,
+  this_month_saved NUMERIC,
+  goals JSON,
+  recent_transactions JSON
+) AS $$
+  SELECT
+    COALESCE(t.total_saved, 0),
+    g.goals_count,
+    g.active_goals,
+    COALESCE(t.this_month_saved, 0),
+    g.goals,
+    r.recent_transactions
+  FROM (
+    SELECT
+      SUM(amount) AS total_saved,
+      SUM(amount) FILTER (
+        WHERE transaction_date >= date_trunc('month', CURRENT_DATE)
+          AND transaction_date < date_trunc('month', CURRENT_DATE) + INTERVAL '1 month'
+      ) AS this_month_saved
+    FROM savings_transactions
+    WHERE user_id = uid
+  ) t,
+  (
+    SELECT
+      COUNT(*) AS goals_count,
+      COUNT(*) FILTER (WHERE sg.current_amount < sg.target_amount) AS active_goals,
+      COALESCE(json_agg(sg), '[]'::json) AS goals
+    FROM savings_goals sg
+    WHERE sg.user_id = uid
+  ) g,
+  (
+    -- Latest 10 transactions, returned oldest first
+    SELECT COALESCE(json_agg(recent ORDER BY recent.transaction_date, recent.id), '[]'::json) AS recent_transactions
+    FROM (
+      SELECT *
+      FROM savings_transactions
+      WHERE user_id = uid
+      ORDER BY transaction_date DESC, id DESC
+      LIMIT 10
+    ) recent
+  ) r;
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION user_stats(UUID) TO service_role;
+
+-- Serves both the per-user aggregates and the latest-transactions lookup
+CREATE INDEX IF NOT EXISTS idx_savings_transactions_user_date
+  ON savings_transactions(user_id, transaction_date DESC);
@@ -0,0 +1,53 @@
+-- Record a savings message from the mascot API in one round trip
+-- Purpose: backend/mascot.py used to read the active goal, create a default goal
+-- when there was none, update current_amount and insert the transaction as up to
+-- four REST calls. This function does all of it in a single transaction, adds
+-- the amount in SQL instead of from a value read earlier, and returns the goal
+-- as a one-row table.
+-- Schema: savings_goals / savings_transactions with the status, transaction_type
+-- and category columns used by backend/mascot.py
+-- Date: 2026-10-15
+
+CREATE OR REPLACE FUNCTION record_mascot_savings(p_user UUID, p_amount NUMERIC, p_desc TEXT)
+RETURNS TABLE (
+  goal_name TEXT,
+  new_total NUMERIC,
+  target_amount NUMERIC
+) AS $$
+#variable_conflict use_column
+DECLARE
+  goal savings_goals%ROWTYPE;
+BEGIN
+  -- Active goal for the user, locked so concurrent entries add up correctly
+  SELECT * INTO goal
+  FROM savings_goals
+  WHERE user_id = p_user
+    AND status = 'active'
+  ORDER BY created_at
+  LIMIT 1
+  FOR UPDATE;
+
+  IF NOT FOUND THEN
+    -- Default ₱10,000 goal for users who have not set one up yet
+    INSERT INTO savings_goals (user_id, goal_name, target_amount, current_amount, status, created_at, target_date)
+    VALUES (p_user, 'My Savings Goal', 10000, 0, 'active', NOW(), NOW() + INTERVAL '365 days')
+    RETURNING * INTO goal;
+  END IF;
+
+  UPDATE savings_goals
+  SET current_amount = current_amount + p_amount,
+      updated_at = NOW()
+  WHERE id = goal.id
+  RETURNING * INTO goal;
+
+  INSERT INTO savings_transactions (user_id, amount, transaction_type, description, transaction_date, category)
+  VALUES (p_user, p_amount, 'savings', p_desc, NOW(), 'savings');
+
+  RETURN QUERY SELECT
+    goal.goal_name::TEXT,
+    goal.current_amount::NUMERIC,
+    goal.target_amount::NUMERIC;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION record_mascot_savings(UUID, NUMERIC, TEXT) TO service_role;
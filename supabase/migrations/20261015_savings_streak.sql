@@ -0,0 +1,28 @@
+-- Current savings streak for the mascot stats endpoint
+-- Purpose: backend/mascot.py used to download the user's last 30 transactions
+-- and count consecutive savings days in Python. This function returns the
+-- streak (the number of consecutive days, ending today, with at least one
+-- savings transaction) as a one-row table.
+-- Schema: savings_transactions with the transaction_type column used by backend/mascot.py
+-- Date: 2026-10-15
+
+CREATE OR REPLACE FUNCTION savings_streak(p_user UUID)
+RETURNS TABLE (streak INTEGER) AS $$
+  SELECT COUNT(*)::INTEGER
+  FROM (
+    SELECT
+      d,
+      ROW_NUMBER() OVER (ORDER BY d DESC) AS rn
+    FROM (
+      SELECT DISTINCT transaction_date::date AS d
+      FROM savings_transactions
+      WHERE user_id = p_user
+        AND transaction_type = 'savings'
+        AND transaction_date::date <= CURRENT_DATE
+    ) days
+  ) ranked
+  -- Days stay aligned with CURRENT_DATE - (rn - 1) only until the first gap
+  WHERE d = CURRENT_DATE - (rn - 1)::INTEGER;
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION savings_streak(UUID) TO service_role;